@@ -2,7 +2,7 @@
 """Runner script to start MqttRemoteSubscriber as a long-running service."""
 import os
 import signal
-import time
+import threading
 import logging
 
 from panasonic_viera.remote_control import RemoteControl
@@ -63,22 +63,18 @@ def main():
     subscriber.start()
 
     # Graceful shutdown on signals
+    stop_event = threading.Event()
+
     def _shutdown(signum, frame):
         _LOGGER.info("Received signal %s, stopping...", signum)
-        try:
-            subscriber.stop()
-        except Exception as exc:
-            _LOGGER.exception("Error while stopping subscriber: %s", exc)
-        raise SystemExit(0)
+        stop_event.set()
 
     signal.signal(signal.SIGTERM, _shutdown)
     signal.signal(signal.SIGINT, _shutdown)
 
-    # Keep running until stopped
+    # Block until a signal arrives; no periodic wakeups while idle
     try:
-        while True:
-            time.sleep(1)
-    except SystemExit:
+        stop_event.wait()
         _LOGGER.info("Service exiting")
     except Exception:
         _LOGGER.exception("Unhandled exception in service loop")
@@ -1,15 +1,97 @@
 """MQTT subscriber that calls RemoteControl.send_key on received messages."""
 import json
 import logging
+import re
+import threading
+import time
 from typing import Optional
 
 import paho.mqtt.client as mqtt
 
 from .remote_control import RemoteControl
 from .keys import Keys
+from .exceptions import SOAPError, EncryptionRequired
+
+try:
+    # Optional SIMD-accelerated JSON; orjson.dumps returns bytes, which
+    # paho accepts as a publish payload.
+    from orjson import loads as _json_loads, dumps as _json_dumps
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 _LOGGER = logging.getLogger(__name__)
 
+# Precomputed lookup maps so key resolution is two dict probes instead of
+# enum subscripting with exception handling on every miss.
+_KEYS_BY_NAME = dict(Keys.__members__)  # includes aliases, like Keys[...]
+_KEYS_BY_VALUE = {k.value: k for k in Keys}
+
+# Canonical set of special query commands; hash membership is O(1) and the
+# dominant "not a command" path pays a single probe.
+_COMMANDS = frozenset({"APPS", "DEVICE_INFO", "VECTOR_INFO"})
+
+# Compiled alternation over the command literals: recognition runs entirely
+# inside the C regex engine instead of Python-level bytecode.
+_CMD_RE = re.compile(r"\A(?:%s)\Z" % "|".join(map(re.escape, sorted(_COMMANDS))))
+
+# Only renew the TV session for failures that can actually be session
+# related, and at most once per cooldown window: renewing involves a TCP
+# handshake plus crypto, which a flood of bad keys must not amplify.
+_RENEW_EXCEPTIONS = (SOAPError, EncryptionRequired, OSError)
+_RENEW_COOLDOWN = 5.0
+
+
+def _parse_payload(msg, _loads=_json_loads):
+    """Extract the command payload from an MQTT message.
+
+    Module-level rather than a method: it reads nothing from the
+    subscriber, and a plain function call skips the bound-method step in
+    the per-message path.
+    """
+    # errors="replace" never raises, so no exception machinery on the
+    # decode; malformed input is still rejected via the replacement
+    # character sentinel below.
+    payload_text = msg.payload.decode("utf-8", "replace").strip()
+    if "\ufffd" in payload_text:
+        _LOGGER.error("Failed to decode MQTT payload: %r", msg.payload)
+        return None
+
+    # Fast path: plain key strings like "VOLUME_UP" cannot be JSON, so
+    # skip parser setup (and the exception on failure) unless the first
+    # character could start a JSON document.
+    if not payload_text or payload_text[0] not in '{["-0123456789tfn':
+        return payload_text
+
+    try:
+        data = _loads(payload_text)
+        if isinstance(data, dict):
+            return data.get("key") or data.get("action") or payload_text
+        return data
+    except Exception:
+        return payload_text
+
+
+def _resolve_key(payload, name_map=_KEYS_BY_NAME, value_map=_KEYS_BY_VALUE):
+    """Resolve a payload to a Keys member, an int key code, or None.
+
+    Single flat function so the per-message hot path is just type checks
+    and dict probes, all executing in C.
+    """
+    # Exact type checks: faster than isinstance (no MRO walk) and payloads
+    # only ever carry plain str/int anyway.
+    t = type(payload)
+    if t is str:
+        # Fast path: remote apps almost always publish uppercase enum
+        # names, so try the raw payload before paying for .upper().
+        key = name_map.get(payload)
+        if key is not None:
+            return key
+        return name_map.get(payload.upper()) or value_map.get(payload)
+    if t is int:
+        return payload
+    return None
+
 
 class MqttRemoteSubscriber:
     """Subscribe to an MQTT topic and forward received key commands to a RemoteControl.
@@ -19,8 +101,33 @@ class MqttRemoteSubscriber:
     - Otherwise the raw payload string is used.
     - If the extracted value matches a Keys enum (by name or value) the enum is used,
       otherwise the raw string is passed to RemoteControl.send_key.
+
+    Queries can also be sent on dedicated sub-topics (<topic>/query/apps,
+    <topic>/query/device_info, <topic>/query/vector_info), which paho routes
+    to their handlers directly without touching the generic message path.
     """
 
+    # Fixed-offset attribute storage: the receive callback does several
+    # self.* loads per message, and slots also shrink the instance.
+    __slots__ = (
+        "remote",
+        "broker",
+        "port",
+        "topic",
+        "qos",
+        "_topic_apps",
+        "_topic_device_info",
+        "_topic_vector_info",
+        "_client",
+        "_cmd_table",
+        "_cmd_table_bytes",
+        "_query_topics",
+        "_publish_lock",
+        "_publish_queue",
+        "_json_cache",
+        "_last_renew_ts",
+    )
+
     def __init__(
         self,
         remote: RemoteControl,
@@ -31,6 +138,7 @@ class MqttRemoteSubscriber:
         username: Optional[str] = None,
         password: Optional[str] = None,
         qos: int = 0,
+        clean_session: Optional[bool] = None,
     ):
         self.remote = remote
         self.broker = broker
@@ -38,10 +146,55 @@ class MqttRemoteSubscriber:
         self.topic = topic
         self.qos = qos
 
-        self._client = mqtt.Client(client_id=client_id) if client_id else mqtt.Client()
+        # Response topics, precomputed so handlers skip a string concat
+        # per query (we only ever subscribe to self.topic).
+        self._topic_apps = f"{topic}/apps"
+        self._topic_device_info = f"{topic}/device_info"
+        self._topic_vector_info = f"{topic}/vector_info"
+
+        # Single construction path: paho generates a random client id for a
+        # None/empty client_id, so no separate no-id branch is needed.
+        # clean_session=False (with a fixed client_id) keeps subscription
+        # state across reconnects, saving a round-trip on reconnect.
+        self._client = mqtt.Client(
+            client_id=client_id, clean_session=clean_session, transport="tcp"
+        )
         if username is not None:
             self._client.username_pw_set(username, password)
 
+        # Command dispatch table: O(1) lookup instead of chained comparisons
+        # in the per-message receive path.
+        self._cmd_table = {
+            "APPS": self._handle_apps,
+            "DEVICE_INFO": self._handle_device_info,
+            "VECTOR_INFO": self._handle_vector_info,
+        }
+        # Bytes-keyed view of the same table: lets _on_message match a bare
+        # command with one memcmp, before paying for UTF-8 decode and JSON.
+        self._cmd_table_bytes = {
+            name.encode("ascii"): handler for name, handler in self._cmd_table.items()
+        }
+        # Dedicated query sub-topics, registered with message_callback_add
+        # so paho's topic matcher routes them without the generic
+        # _on_message dispatch. Responses publish outside /query/, so the
+        # subscriber never receives its own replies.
+        self._query_topics = {
+            f"{topic}/query/{name.lower()}": handler
+            for name, handler in self._cmd_table.items()
+        }
+
+        # Outbound responses are queued by the handlers and flushed once per
+        # callback, so a burst of queries pays one publish pass.
+        self._publish_lock = threading.Lock()
+        self._publish_queue = []
+
+        # Per-topic cache of the last serialized response: the apps list
+        # and device info rarely change, so repeated queries reuse the
+        # previous encoding instead of re-serializing.
+        self._json_cache = {}
+
+        self._last_renew_ts = -_RENEW_COOLDOWN
+
         # Bind callbacks
         self._client.on_connect = self._on_connect
         self._client.on_message = self._on_message
@@ -64,6 +217,7 @@ class MqttRemoteSubscriber:
         _LOGGER.debug("Stopping MQTT subscriber")
         try:
             self._client.unsubscribe(self.topic)
+            self._client.unsubscribe(f"{self.topic}/query/+")
         except Exception:
             # ignore unsubscribe errors
             pass
@@ -82,6 +236,9 @@ class MqttRemoteSubscriber:
             )
             try:
                 client.subscribe(self.topic, qos=self.qos)
+                client.subscribe(f"{self.topic}/query/+", qos=self.qos)
+                for query_topic in self._query_topics:
+                    client.message_callback_add(query_topic, self._on_query_message)
                 _LOGGER.debug(
                     "Subscribed to topic %s (qos=%d)", self.topic, self.qos
                 )
@@ -93,72 +250,113 @@ class MqttRemoteSubscriber:
     def _on_disconnect(self, client, userdata, rc):
         _LOGGER.info("Disconnected from MQTT broker (rc=%s)", rc)
 
+    # Thin wrappers kept for backwards compatibility; the hot path in
+    # _on_message calls the module-level functions directly.
     def _get_payload(self, msg):
-        try:
-            payload_text = msg.payload.decode("utf-8").strip()
-        except Exception:
-            _LOGGER.exception("Failed to decode MQTT payload")
-            return None
-        
-        try:
-            data = json.loads(payload_text)
-            if isinstance(data, dict):
-                return data.get("key") or data.get("action") or payload_text
-            else:                
-                return data
-        except Exception:            
-            return payload_text
-        
-    def _get_key_to_send(self,payload):
-        try:            
-            if isinstance(payload, str):
-                try:
-                    return Keys[payload.upper()]
-                except KeyError:
-                    try:
-                        return Keys(payload)
-                    except Exception:
-                        return None
-            elif isinstance(payload, (int,)):
-                return payload
-        except Exception:
-            _LOGGER.debug("Could not map payload to Keys enum: %s", payload)
-            return None
+        return _parse_payload(msg)
+
+    def _get_key_to_send(self, payload):
+        return _resolve_key(payload)
+
+    def _enqueue_publish(self, topic, payload):
+        with self._publish_lock:
+            self._publish_queue.append((topic, payload))
+
+    def _flush_publishes(self, client):
+        with self._publish_lock:
+            pending, self._publish_queue = self._publish_queue, []
+        for topic, payload in pending:
+            client.publish(topic, payload)
+
+    def _serialize_cached(self, topic, obj):
+        # An equality check on the previous response is far cheaper than
+        # re-serializing it; only encode when the content actually changed.
+        cached = self._json_cache.get(topic)
+        if cached is not None and cached[0] == obj:
+            return cached[1]
+        payload = _json_dumps(obj)
+        self._json_cache[topic] = (obj, payload)
+        return payload
+
+    # Command handlers (dispatched via self._cmd_table)
+    def _handle_apps(self, client, msg):
+        apps = self.remote.get_apps()
+        self._enqueue_publish(self._topic_apps, self._serialize_cached(self._topic_apps, apps))
+        _LOGGER.info("Available apps: %s", apps)
+
+    def _handle_device_info(self, client, msg):
+        info = self.remote.get_device_info()
+        self._enqueue_publish(
+            self._topic_device_info, self._serialize_cached(self._topic_device_info, info)
+        )
+        _LOGGER.info("TV Info: %s", info)
+
+    def _handle_vector_info(self, client, msg):
+        info = self.remote.get_vector_info()
+        self._enqueue_publish(
+            self._topic_vector_info, self._serialize_cached(self._topic_vector_info, info)
+        )
+        _LOGGER.info("Vector Info: %s", info)
 
-    def _on_message(self, client, userdata, msg):
-        payload = self._get_payload(msg)
+    def _on_query_message(self, client, userdata, msg):
+        # paho has already matched the topic; one exact-topic dict probe
+        # picks the handler, the payload is irrelevant.
+        handler = self._query_topics.get(msg.topic)
+        if handler is not None:
+            handler(client, msg)
+            self._flush_publishes(client)
+
+    def _on_message(
+        self,
+        client,
+        userdata,
+        msg,
+        # Default-arg bindings turn these per-message global/attribute
+        # lookups into LOAD_FAST accesses.
+        _parse=_parse_payload,
+        _resolve=_resolve_key,
+        _cmd_match=_CMD_RE.match,
+    ):
+        # Bare commands are matched on the raw bytes so the common query
+        # path never decodes or parses the payload.
+        handler = self._cmd_table_bytes.get(msg.payload.strip())
+        if handler is not None:
+            handler(client, msg)
+            return self._flush_publishes(client)
+
+        payload = _parse(msg)
+
+        # Gate debug logs so INFO deployments skip LogRecord setup on the
+        # per-message path entirely.
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
 
         if payload is None:
-            _LOGGER.debug("Empty payload received on topic %s", msg.topic)
-            return
-        
-        if payload == "APPS":
-            apps = self.remote.get_apps()
-            client.publish(msg.topic + "/apps", json.dumps(apps))
-            _LOGGER.info("Available apps: %s", apps)
+            if debug:
+                _LOGGER.debug("Empty payload received on topic %s", msg.topic)
             return
-        
-        if payload == "DEVICE_INFO":
-            info = self.remote.get_device_info()
-            client.publish(msg.topic + "/device_info", json.dumps(info))
-            _LOGGER.info("TV Info: %s", info)
-            return
-        
-        if payload == "VECTOR_INFO":
-            info = self.remote.get_vector_info()
-            client.publish(msg.topic + "/vector_info", json.dumps(info))
-            _LOGGER.info("Vector Info: %s", info)
-            return
-                
-        key_to_send = self._get_key_to_send(payload)
-        
+
+        t = type(payload)
+        if t is str and _cmd_match(payload):
+            self._cmd_table[payload](client, msg)
+            return self._flush_publishes(client)
+
+        key_to_send = _resolve(payload)
+
         try:
             if key_to_send is None:
-                _LOGGER.debug("Sending raw key via payload: %s", payload)
-                self.remote.send_key(str(payload))
+                if t is not str:
+                    payload = str(payload)
+                if debug:
+                    _LOGGER.debug("Sending raw key via payload: %s", payload)
+                self.remote.send_key(payload)
             else:
-                _LOGGER.debug("Sending key via enum: %s", key_to_send)
+                if debug:
+                    _LOGGER.debug("Sending key via enum: %s", key_to_send)
                 self.remote.send_key(key_to_send)
-        except Exception:
+        except Exception as exc:
             _LOGGER.exception("Failed to send key from MQTT payload: %s", payload)
-            self.remote.renew_session()
\ No newline at end of file
+            if isinstance(exc, _RENEW_EXCEPTIONS):
+                now = time.monotonic()
+                if now - self._last_renew_ts >= _RENEW_COOLDOWN:
+                    self._last_renew_ts = now
+                    self.remote.renew_session()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import MagicMock
+import json
+
+from panasonic_viera.mqtt_remote import MqttRemoteSubscriber
+from panasonic_viera.remote_control import RemoteControl
+
+
+class TestQueryTopicRouting(unittest.TestCase):
+    def setUp(self):
+        self.remote = MagicMock(spec=RemoteControl)
+        self.subscriber = MqttRemoteSubscriber(self.remote)
+        self.client = MagicMock()
+
+    def _create_msg(self, topic: str, payload: bytes = b""):
+        msg = MagicMock()
+        msg.topic = topic
+        msg.payload = payload
+        return msg
+
+    def test_apps_query_publishes_to_apps_topic(self):
+        apps = [{"name": "Netflix", "id": "0010000200000001"}]
+        self.remote.get_apps.return_value = apps
+        msg = self._create_msg("panasonic/remote/query/apps")
+        self.subscriber._on_query_message(self.client, None, msg)
+        self.remote.get_apps.assert_called_once()
+        self.client.publish.assert_called_once()
+        topic, payload = self.client.publish.call_args[0]
+        self.assertEqual(topic, "panasonic/remote/apps")
+        # json.loads accepts str or bytes, covering the orjson fallback
+        self.assertEqual(json.loads(payload), apps)
+
+    def test_device_info_query_publishes_to_device_info_topic(self):
+        info = {"friendly_name": "VIERA"}
+        self.remote.get_device_info.return_value = info
+        msg = self._create_msg("panasonic/remote/query/device_info")
+        self.subscriber._on_query_message(self.client, None, msg)
+        topic, payload = self.client.publish.call_args[0]
+        self.assertEqual(topic, "panasonic/remote/device_info")
+        self.assertEqual(json.loads(payload), info)
+
+    def test_unknown_query_topic_is_a_noop(self):
+        msg = self._create_msg("panasonic/remote/query/unknown")
+        self.subscriber._on_query_message(self.client, None, msg)
+        self.client.publish.assert_not_called()
+        self.remote.get_apps.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from unittest.mock import MagicMock
+
+from panasonic_viera.mqtt_remote import MqttRemoteSubscriber, _RENEW_COOLDOWN
+from panasonic_viera.remote_control import RemoteControl
+
+
+class TestRenewSessionOnFailure(unittest.TestCase):
+    def setUp(self):
+        self.remote = MagicMock(spec=RemoteControl)
+        self.subscriber = MqttRemoteSubscriber(self.remote)
+        self.client = MagicMock()
+
+    def _create_msg(self, payload: bytes):
+        msg = MagicMock()
+        msg.payload = payload
+        msg.topic = "panasonic/remote"
+        return msg
+
+    def test_session_error_renews_once_within_cooldown(self):
+        self.remote.send_key.side_effect = OSError("connection reset")
+        msg = self._create_msg(b"VOLUME_UP")
+        self.subscriber._on_message(self.client, None, msg)
+        self.subscriber._on_message(self.client, None, msg)
+        self.assertEqual(self.remote.renew_session.call_count, 1)
+
+    def test_non_session_error_does_not_renew(self):
+        self.remote.send_key.side_effect = ValueError("bad key")
+        msg = self._create_msg(b"VOLUME_UP")
+        self.subscriber._on_message(self.client, None, msg)
+        self.remote.renew_session.assert_not_called()
+
+    def test_renews_again_after_cooldown(self):
+        self.remote.send_key.side_effect = OSError("connection reset")
+        msg = self._create_msg(b"VOLUME_UP")
+        self.subscriber._on_message(self.client, None, msg)
+        # Simulate the cooldown window having elapsed
+        self.subscriber._last_renew_ts -= _RENEW_COOLDOWN
+        self.subscriber._on_message(self.client, None, msg)
+        self.assertEqual(self.remote.renew_session.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()